@@ -6,10 +6,19 @@ comments from specified subreddits.
 """
 
 import os  # For environment variable management.
+import json  # Persisted last-seen ids between runs.
+import functools  # Caches subreddit-name normalization.
+import tempfile  # Atomic state-file writes.
+import sys  # Single buffered stdout write per item in script mode.
+import random  # Jitter for reconnect backoff.
 import time  # Used for the 'sleep' function to pause the script during reconnection.
+from collections import OrderedDict  # Bounded LRU of recently yielded items.
+import queue  # Thread-safe hand-off between stream workers and the consumer.
+import threading  # Each listing is polled in its own worker thread.
 import logging  # Structured logging.
 import praw  # Python Reddit API Wrapper (PRAW).
 import prawcore  # Used for specific exception handling.
+import requests  # Transport used by prawcore; tuned for connection reuse below.
 from dotenv import load_dotenv  # Load secrets from a local .env file.
 
 
@@ -21,6 +30,16 @@ if not logger.handlers:
         format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     )
 
+# Credentials tuple -> username, for logins already verified by initialize_reddit() in this process.
+_verified_users = {}
+
+# Where stream_reddit_activity() remembers the newest item of each kind between runs,
+# keyed by the normalized subreddit string.
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser('~'), '.reddit_listener_state.json')
+
+# Fullname type prefix -> key in the state file.
+_STATE_KEYS = {'t3': 'last_sub', 't1': 'last_com'}
+
 def initialize_reddit():
     """
     Initializes the Reddit instance using PRAW.
@@ -43,21 +62,46 @@ def initialize_reddit():
         'REDDIT_PASSWORD',
     ]
 
+    # Snapshot the environment once and fail fast with an actionable message.
+    env = {name: os.environ.get(name) for name in required_env_vars}
+    missing = [name for name, value in env.items() if not value]
+    if missing:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+
+    credentials = tuple(env.values())
+    client_id, client_secret, user_agent, username, password = credentials
+
     logger.info('Authenticating with Reddit...')
 
-    # Construct the PRAW client.
+    # Reuse TLS connections across polls: a larger keep-alive pool avoids a fresh handshake
+    # per request when both listings (and ad-hoc lookups) hit Reddit concurrently.
+    # Retries stay disabled here; prawcore and the stream backoff handle them.
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+    # Construct the PRAW client on top of the tuned session.
     reddit = praw.Reddit(
-        client_id=os.getenv('REDDIT_CLIENT_ID'),
-        client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
-        user_agent=os.getenv('REDDIT_USER_AGENT'),
-        username=os.getenv('REDDIT_USERNAME'),
-        password=os.getenv('REDDIT_PASSWORD'),
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent,
+        username=username,
+        password=password,
+        requestor_kwargs={'session': session},
     )
 
+    # Skip the /api/v1/me round trip when these exact credentials were already verified
+    # (e.g. the caller re-initializes after a transient streaming error).
+    if credentials in _verified_users:
+        reddit._verified_user = _verified_users[credentials]
+        logger.info('Reusing verified login for %s', reddit._verified_user)
+        return reddit
+
     # Validate credentials.
     try:
         me = reddit.user.me()
-        logger.info(f'Authentication successful. Logged in as {me}')
+        logger.info('Authentication successful. Logged in as %s', me)
     except (
         prawcore.exceptions.OAuthException,
         prawcore.exceptions.InvalidToken,
@@ -69,101 +113,553 @@ def initialize_reddit():
     ) as e:
         raise RuntimeError(f"Failed to verify Reddit authentication: {e}") from e
 
+    reddit._verified_user = me.name
+    _verified_users[credentials] = me.name
+
     return reddit
 
-def stream_reddit_activity(reddit, sub_reddits):
+def _fullname_id(fullname):
+    """
+    Converts a fullname such as 't3_abc12' into its numeric id.
+
+    Reddit ids are base36 and increase with creation time, so the result can be
+    compared to tell whether an item is newer than another of the same kind.
+    """
+    return int(fullname.partition('_')[2], 36)
+
+def _read_state_file(state_path):
+    """
+    Reads the whole state file: normalized subreddit string -> saved fullnames.
+
+    Returns:
+        dict: The parsed file, or an empty dict when it is missing or unreadable.
+    """
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning('Ignoring unreadable stream state %s: %s', state_path, e)
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def _load_state(state_path, subreddit_string):
+    """
+    Reads the last-seen fullnames saved by a previous run on the same subreddits.
+
+    State is keyed by the normalized subreddit string, so listeners on different
+    subreddits can share one file without resuming from each other's cursors.
+
+    Args:
+        state_path (str | None): State file location, or None when persistence is disabled.
+        subreddit_string (str): Normalized 'a+b' multi-subreddit name.
+
+    Returns:
+        dict: Maps 'last_sub'/'last_com' to fullnames. Empty when there is no usable state.
+    """
+    if state_path is None:
+        return {}
+    state = _read_state_file(state_path).get(subreddit_string)
+    if not isinstance(state, dict):
+        return {}
+    loaded = {}
+    for prefix, key in _STATE_KEYS.items():
+        fullname = state.get(key)
+        # Only accept well-formed fullnames of the right kind; anything else is a cold start.
+        if isinstance(fullname, str) and fullname.startswith(prefix + '_'):
+            try:
+                _fullname_id(fullname)
+            except ValueError:
+                continue
+            loaded[key] = fullname
+    return loaded
+
+def _save_state(state_path, subreddit_string, state):
+    """
+    Writes the last-seen fullnames so the next run can resume where this one stopped.
+
+    Entries for other subreddit strings are preserved. The file is written to a temporary
+    sibling and moved into place with os.replace(), so a crash mid-write never leaves a
+    truncated file behind. Failures are logged, not raised: losing the state only costs
+    a cold start.
+    """
+    if state_path is None or not state:
+        return
+    saved = _read_state_file(state_path)
+    saved[subreddit_string] = state
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            'w',
+            encoding='utf-8',
+            dir=os.path.dirname(os.path.abspath(state_path)),
+            prefix='.reddit_listener_state.',
+            suffix='.tmp',
+            delete=False,
+        ) as f:
+            tmp_path = f.name
+            json.dump(saved, f)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        logger.warning('Could not save stream state to %s: %s', state_path, e)
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def _as_dict(item):
+    """
+    Flattens a streamed Submission/Comment into a plain dict of listing fields.
+
+    Reads the instance __dict__ directly: PRAW objects fetch themselves over HTTP on
+    access to any attribute the listing did not include (e.g. getattr(comment, 'title')),
+    and the point of this shape is that consumers can never trigger such a request.
+
+    Args:
+        item (praw.models.Submission | praw.models.Comment): A streamed item.
+
+    Returns:
+        dict: id, type, subreddit, title, body, permalink and created_utc. title is None
+            for comments and body is None for submissions.
+    """
+    data = vars(item)
+    return {
+        'id': data.get('id'),
+        'type': type(item).__name__,
+        'subreddit': data.get('subreddit_name_prefixed'),
+        'title': data.get('title'),
+        'body': data.get('body'),
+        'permalink': data.get('permalink'),
+        'created_utc': data.get('created_utc'),
+    }
+
+class _StreamFailure:
+    """
+    Sentinel placed on the shared queue when a stream worker dies.
+
+    Carries the original exception so the consumer can re-raise it in the main thread,
+    where the retry/backoff logic lives.
+    """
+
+    def __init__(self, error):
+        self.error = error
+
+class _ListingCursor:
+    """
+    Message placed on the shared queue when a worker learns a cursor without yielding items.
+
+    The cold-start poll skips what is already posted but still finds the newest fullname;
+    handing it to the consumer lets reconnects and the state file resume from it instead of
+    starting cold again (and silently skipping whatever was posted in between).
+    """
+
+    def __init__(self, fullname):
+        self.fullname = fullname
+
+def _poll_listing(reddit, request_lock, path, last_fullname, anchored=True, limit=100):
+    """
+    Fetches one page of a listing and returns the items newer than last_fullname.
+
+    With anchored=True the request passes last_fullname as Reddit's 'before' cursor, so
+    only unseen items come back and a single request covers each poll. Reddit answers an
+    anchored request with an empty page forever once the anchor item is deleted or
+    removed, so callers periodically poll unanchored; items are then filtered by id.
+
+    Args:
+        reddit (praw.Reddit): An authenticated Reddit client.
+        request_lock (threading.Lock): Serializes requests on the shared client.
+        path (str): Listing path, e.g. 'r/a+b/new' or 'r/a+b/comments'.
+        last_fullname (str | None): Newest fullname already handled, or None for no cursor.
+        anchored (bool): Send last_fullname as the 'before' cursor.
+        limit (int): Page size; 1 is enough when only the newest fullname is wanted.
+
+    Returns:
+        tuple[list, str | None]: New items oldest-first, and the fullname to poll from next.
+    """
+    params = {'limit': limit}
+    if anchored and last_fullname is not None:
+        params['before'] = last_fullname
+    # Listings come newest-first; hand items on in the order they were posted.
+    with request_lock:
+        listing = list(reddit.get(path, params=params))
+    items = listing[::-1]
+    if last_fullname is not None:
+        last_id = _fullname_id(last_fullname)
+        items = [item for item in items if _fullname_id(item.fullname) > last_id]
+    if items:
+        last_fullname = items[-1].fullname
+    return items, last_fullname
+
+def _poll_worker(
+    reddit,
+    request_lock,
+    path,
+    last_fullname,
+    item_queue,
+    stop,
+    min_interval,
+    max_interval,
+    target_items=10,
+    reanchor_every=10,
+):
+    """
+    Polls one listing and pushes every new item onto the shared queue.
+
+    Runs in a worker thread, one per listing. Without a last_fullname the first poll only
+    records the newest item (nothing already posted is yielded) and reports it to the
+    consumer as a _ListingCursor.
+
+    The worker keeps an exponential moving average of items per poll and waits roughly
+    target_items / rate seconds before the next one, so busy subreddits are polled as
+    often as min_interval allows and quiet ones back off towards max_interval. Waiting on
+    the stop event instead of sleeping lets an abandoned worker exit promptly. Exceptions
+    are forwarded as a _StreamFailure sentinel instead of being swallowed by the thread.
+
+    Args:
+        reddit (praw.Reddit): An authenticated Reddit client.
+        request_lock (threading.Lock): Shared by all workers on this client; see _poll_listing().
+        path (str): Listing path passed to _poll_listing().
+        last_fullname (str | None): Newest fullname already handled, if known.
+        item_queue (queue.SimpleQueue): Queue shared with the consuming generator.
+        stop (threading.Event): Set by the consumer when this attempt is abandoned.
+        min_interval (float): Shortest wait between polls, in seconds.
+        max_interval (float): Longest wait between polls, in seconds.
+        target_items (float): Items we would like each poll to pick up on average.
+        reanchor_every (int): After this many consecutive empty polls, poll once without
+            the 'before' cursor in case its anchor item has disappeared.
+    """
+    ema_rate = float(target_items)  # start neutral: the first wait is 1s before clamping
+    empty_polls = 0
+    try:
+        if last_fullname is None:
+            # Cold-start probe: only the newest fullname matters, so fetch a single item.
+            _, last_fullname = _poll_listing(reddit, request_lock, path, None, limit=1)
+            if last_fullname is not None:
+                item_queue.put(_ListingCursor(last_fullname))
+        while not stop.wait(
+            min(max_interval, max(min_interval, target_items / max(ema_rate, 0.1)))
+        ):
+            anchored = empty_polls < reanchor_every
+            items, last_fullname = _poll_listing(
+                reddit, request_lock, path, last_fullname, anchored
+            )
+            empty_polls = 0 if items or not anchored else empty_polls + 1
+            # Learn from how much this poll returned; it sets the next wait.
+            ema_rate = 0.9 * ema_rate + 0.1 * len(items)
+            for item in items:
+                item_queue.put(item)
+    except Exception as e:
+        item_queue.put(_StreamFailure(e))
+
+@functools.lru_cache(maxsize=32)
+def _normalize_subreddits(sub_reddits):
+    """
+    Builds the 'a+b' multi-subreddit string Reddit accepts from a list of names.
+
+    Names are stripped, lowercased and lose an optional '/r/' or 'r/' prefix; blanks and
+    repeats are dropped (first occurrence wins). Cached, so restarting streams for the
+    same (possibly long) list does no repeat work.
+
+    Args:
+        sub_reddits (tuple[str] | str): Subreddit names, or an already joined 'a+b' string.
+
+    Returns:
+        str: The normalized multi-subreddit name, or '' when no usable names remain.
+    """
+    names = sub_reddits.split('+') if isinstance(sub_reddits, str) else sub_reddits
+    # Lowercase first so 'R/Foo' loses its prefix too; filter after stripping so a bare
+    # 'r/' does not survive as an empty name.
+    subs = [
+        name.removeprefix('/r/').removeprefix('r/')
+        for name in map(str.lower, map(str.strip, names))
+    ]
+    # dict.fromkeys keeps order while dropping duplicates such as 'rust' and 'r/rust'.
+    return '+'.join(dict.fromkeys(filter(None, subs)))
+
+def stream_reddit_activity(
+    reddit,
+    sub_reddits,
+    min_interval=2.0,
+    max_interval=16.0,
+    include_submissions=True,
+    include_comments=True,
+    state_path=DEFAULT_STATE_PATH,
+    as_dict=False,
+):
     """
-    Yields a combined stream of new submissions and comments from one or more subreddits.
+    Returns a combined stream of new submissions and comments from one or more subreddits.
+
+    Arguments are validated immediately; the returned generator does the streaming.
 
     This function is designed to run indefinitely (until interrupted) and includes
     resilience features like exponential backoff for transient errors.
 
     Args:
         reddit (praw.Reddit): An authenticated Reddit client.
-        sub_reddits (list[str]): Subreddit names (without the 'r/' prefix).
+        sub_reddits (list[str] | str): Subreddit names (an 'r/' prefix is tolerated), or a
+            precomputed 'a+b' string.
+        min_interval (float): Shortest wait between polls of one listing, in seconds. Each
+            listing is polled at most once per min_interval, so the combined request rate
+            is at most (number of listings) / min_interval: 1 req/s with the default and
+            both listings, which is Reddit's 600-requests-per-600s budget.
+        max_interval (float): Longest wait between polls of a quiet listing, in seconds.
+        include_submissions (bool): Poll the submissions listing. Disable when only comments
+            are consumed; the listing is then never requested, halving API usage.
+        include_comments (bool): Poll the comments listing. Disable when only submissions
+            are consumed.
+        state_path (str | None): JSON file holding the newest submission/comment fullnames,
+            keyed by the normalized subreddit string. When a previous run on the same
+            subreddits left one behind, polling resumes right after those items instead of
+            skipping everything already posted, so nothing published while the listener was
+            down is lost. Written atomically every 30 seconds while there is progress and
+            when the generator finishes. None disables persistence.
+        as_dict (bool): Yield plain dicts of the fields already present in the listing
+            instead of PRAW objects, so downstream code cannot trigger lazy per-item fetches.
+
+    Returns:
+        Iterator[praw.models.Submission | praw.models.Comment | dict]: New items from the
+            monitored subreddits (dicts when as_dict is True; see _as_dict).
 
-    Yields:
-        praw.models.Submission | praw.models.Comment: Next item from the monitored subreddits.
+    Raises:
+        ValueError: When sub_reddits contains no usable subreddit names, when both
+            include_submissions and include_comments are False, or unless
+            0 < min_interval <= max_interval.
 
     Notes:
         - For long-running services, prefer logging over print to preserve context and levels.
         - Backoff with jitter helps avoid retry storms when Reddit is under load.
-        - Use KeyboardInterrupt (Ctrl+C) to stop gracefully when running as a script.
+        - Poll pacing adapts to each stream's recent activity within [min_interval, max_interval].
+        - KeyboardInterrupt (Ctrl+C) stops the workers and ends the stream normally; the
+          client's HTTP session is closed whenever the generator finishes.
     """
-    # Convert a list like ['a', 'b'] into 'a+b' which Reddit accepts as a multi-subreddit.
-    subreddit_string = '+'.join(s.strip() for s in sub_reddits)
+    # Normalize up front, outside the generator, so a misconfigured list raises here at
+    # call time rather than on the first iteration (or as a 404 after backoff retries).
+    subreddit_string = _normalize_subreddits(
+        sub_reddits if isinstance(sub_reddits, str) else tuple(sub_reddits)
+    )
+    if not subreddit_string:
+        raise ValueError(f'No subreddit names given (got {sub_reddits!r}).')
+
+    if not (include_submissions or include_comments):
+        raise ValueError('At least one of include_submissions/include_comments must be True.')
 
-    # PRAW object that exposes .stream.submissions() and .stream.comments().
-    subreddit = reddit.subreddit(subreddit_string)
+    # A non-positive wait would turn the workers' stop.wait() into a busy loop on the API.
+    if not 0 < min_interval <= max_interval:
+        raise ValueError(
+            f'Expected 0 < min_interval <= max_interval (got {min_interval}, {max_interval}).'
+        )
 
+    return _stream_activity(
+        reddit,
+        subreddit_string,
+        min_interval,
+        max_interval,
+        include_submissions,
+        include_comments,
+        state_path,
+        as_dict,
+    )
+
+def _stream_activity(
+    reddit,
+    subreddit_string,
+    min_interval,
+    max_interval,
+    include_submissions,
+    include_comments,
+    state_path,
+    as_dict,
+):
+    """
+    Generator behind stream_reddit_activity(); arguments are already validated there.
+    """
     # Retry/backoff settings (tune these based on your operational needs).
     backoff_seconds = 5  # initial backoff after the first transient error
     max_backoff_seconds = 180  # cap to prevent excessive waiting
-    while True:
-        try:
-            logger.info(f'Starting stream from subreddits: {subreddit_string}')
-
-            # Non-blocking streams: pause_after=0 yields None when no items are available,
-            # allowing us to alternate between submissions and comments.
-            submissions_stream = subreddit.stream.submissions(skip_existing=True, pause_after=0)
-            comments_stream = subreddit.stream.comments(skip_existing=True, pause_after=0)
-
-            # Reset backoff since (re)starting the streams succeeded.
-            backoff_seconds = 5
-
-            # Round-robin: drain available items from each stream; sleep briefly if none are available.
-            while True:
-                # Submissions: None means the stream currently has no more items to yield.
-                for submission in submissions_stream:
-                    if submission is None:
-                        break
-                    yield submission
-
-                # Comments: same semantics as above.
-                for comment in comments_stream:
-                    if comment is None:
-                        break
-                    yield comment
-
-                # Prevent a tight loop when no new items are currently available.
-                time.sleep(0.5)
-
-        except KeyboardInterrupt:
-            # Let the caller (or __main__) handle shutdown; this keeps cleanup straightforward.
-            logger.info("Stream interrupted by user. Shutting down.")
-            raise
-        except (prawcore.exceptions.Forbidden, prawcore.exceptions.NotFound) as e:
-            # Likely invalid or private subreddit(s); these will not self-heal by retrying.
-            logger.error(f'Access issue for subreddits "{subreddit_string}": {e}. Stopping stream.')
-            raise
-        except (prawcore.exceptions.OAuthException, prawcore.exceptions.InvalidToken) as e:
-            # Auth issues typically require operator intervention (refresh/rotate creds).
-            logger.error(f'Authentication error while streaming: {e}. Stopping stream.')
-            raise
-        except (
-            prawcore.exceptions.RequestException,   # network hiccups/timeouts
-            prawcore.exceptions.ResponseException,  # unexpected HTTP issues
-            prawcore.exceptions.ServerError,        # 5xx from Reddit
-            # praw.exceptions.APIException,         # optionally include if you inspect and decide it’s transient
-        ) as e:
-            # Transient conditions: apply exponential backoff with a small jitter to avoid synchronized retries.
-            logger.warning(f'Error streaming from Reddit: {e}')
-            jitter = 0.5 + (time.time() % 1) * 0.5  # small, deterministic jitter in [0.5, 1.0)
-            sleep_for = min(max_backoff_seconds, int(backoff_seconds * (1.5 + jitter)))
-            logger.info(f'Reconnecting in {sleep_for} seconds...')
-            time.sleep(sleep_for)
-            backoff_seconds = min(max_backoff_seconds, max(5, sleep_for * 2))
-        except Exception as e:
-            # Catch-all: log and retry after a fixed delay. Consider alerting if this repeats.
-            logger.error(f'Unexpected error: {e}')
-            logger.info('Reconnecting in 15 seconds...')
-            time.sleep(15)
+    healthy_after_seconds = 60  # an attempt that survives this long resets the backoff
+
+    # Listings occasionally repeat items (notably across reconnects); remember recently
+    # yielded fullnames so downstream consumers never process the same post/comment twice.
+    seen = OrderedDict()
+    max_seen = 4096
+
+    # Newest fullname yielded per kind ('last_sub'/'last_com'), seeded from the previous run.
+    last_seen = _load_state(state_path, subreddit_string)
+
+    # Save the cursors periodically too, so SIGTERM (e.g. docker stop) or a hard kill loses
+    # at most this many seconds of progress rather than the whole run.
+    state_save_seconds = 30
+    state_saved_at = time.monotonic()
+    state_dirty = False
+
+    # PRAW is not thread-safe: prawcore's rate limiter and token refresh are unlocked, and
+    # a client fresh from initialize_reddit()'s verified-login shortcut has no token yet, so
+    # concurrent first requests would race to fetch one. All workers share this one client
+    # (separate clients would each need their own login and split the rate-limit view), so
+    # their requests go through a single lock; the waits between polls stay independent.
+    request_lock = threading.Lock()
+    try:
+        while True:
+            # Per attempt: tells this attempt's workers to stop once it is abandoned.
+            stop_event = threading.Event()
+            try:
+                logger.info('Starting stream from subreddits: %s', subreddit_string)
+
+                # Poll the listings directly: one request per poll, resuming from the newest
+                # item already yielded (or, on a cold start, skipping what is already posted).
+                # Only the requested kinds are polled, so an unused listing costs no API calls.
+                listings = []
+                if include_submissions:
+                    listings.append((f'r/{subreddit_string}/new', last_seen.get('last_sub')))
+                if include_comments:
+                    listings.append((f'r/{subreddit_string}/comments', last_seen.get('last_com')))
+
+                # Nothing has been requested yet; remember when this attempt started and judge
+                # its health when it fails. Monotonic, so wall-clock adjustments (NTP,
+                # container clock sync) cannot distort the measurement.
+                started_at = time.monotonic()
+
+                # Poll each listing in its own thread so neither blocks the other.
+                item_queue = queue.SimpleQueue()
+                workers = [
+                    threading.Thread(
+                        target=_poll_worker,
+                        args=(
+                            reddit,
+                            request_lock,
+                            path,
+                            last_fullname,
+                            item_queue,
+                            stop_event,
+                            min_interval,
+                            max_interval,
+                        ),
+                        daemon=True,
+                    )
+                    for path, last_fullname in listings
+                ]
+                for worker in workers:
+                    worker.start()
+
+                try:
+                    while True:
+                        if state_dirty and time.monotonic() - state_saved_at >= state_save_seconds:
+                            _save_state(state_path, subreddit_string, last_seen)
+                            state_saved_at = time.monotonic()
+                            state_dirty = False
+                        try:
+                            # Time out so a quiet period still gets its pending state saved.
+                            item = item_queue.get(timeout=state_save_seconds)
+                        except queue.Empty:
+                            continue
+                        if isinstance(item, _StreamFailure):
+                            # Surface worker errors here so the handlers below can classify them.
+                            raise item.error
+                        if isinstance(item, _ListingCursor):
+                            # Cold-start cursor: resume from here on reconnect / next run.
+                            key = _STATE_KEYS[item.fullname[:2]]
+                            if key not in last_seen:
+                                last_seen[key] = item.fullname
+                                state_dirty = True
+                            continue
+                        # Fullname (t1_/t3_ prefix) keeps comment and submission ids apart.
+                        if item.fullname in seen:
+                            continue
+                        seen[item.fullname] = None
+                        if len(seen) > max_seen:
+                            seen.popitem(last=False)
+                        yield _as_dict(item) if as_dict else item
+                        # The consumer asked for the next item, so this one was handled. Only
+                        # now may it count for resuming: if handling raised, the generator is
+                        # closed at the yield above and the saved state still points before it.
+                        key = _STATE_KEYS[item.fullname[:2]]
+                        if key not in last_seen or (
+                            _fullname_id(item.fullname) > _fullname_id(last_seen[key])
+                        ):
+                            last_seen[key] = item.fullname
+                            state_dirty = True
+                finally:
+                    # Covers errors, Ctrl+C and the consumer closing the generator: the
+                    # workers see the event on their next iteration/wait and exit.
+                    stop_event.set()
+
+            except (prawcore.exceptions.Forbidden, prawcore.exceptions.NotFound) as e:
+                # Likely invalid or private subreddit(s); these will not self-heal by retrying.
+                logger.error('Access issue for subreddits "%s": %s. Stopping stream.', subreddit_string, e)
+                raise
+            except (prawcore.exceptions.OAuthException, prawcore.exceptions.InvalidToken) as e:
+                # Auth issues typically require operator intervention (refresh/rotate creds).
+                logger.error('Authentication error while streaming: %s. Stopping stream.', e)
+                raise
+            except (
+                prawcore.exceptions.RequestException,   # network hiccups/timeouts
+                prawcore.exceptions.ResponseException,  # unexpected HTTP issues
+                prawcore.exceptions.ServerError,        # 5xx from Reddit
+                # praw.exceptions.APIException,         # optionally include if you inspect and decide it’s transient
+            ) as e:
+                # Transient conditions: apply exponential backoff with a small jitter to avoid synchronized retries.
+                logger.warning('Error streaming from Reddit: %s', e)
+                if time.monotonic() - started_at >= healthy_after_seconds:
+                    # The previous attempt ran fine for a while; treat this as a fresh failure.
+                    backoff_seconds = 5
+                # Random +/-20% jitter so co-located processes do not reconnect in lockstep.
+                sleep_for = min(max_backoff_seconds, backoff_seconds) * random.uniform(0.8, 1.2)
+                logger.info('Reconnecting in %.1f seconds...', sleep_for)
+                time.sleep(sleep_for)
+                backoff_seconds = min(max_backoff_seconds, backoff_seconds * 2)
+            except Exception as e:
+                # Catch-all: log and retry after a fixed delay. Consider alerting if this repeats.
+                logger.error('Unexpected error: %s', e)
+                logger.info('Reconnecting in 15 seconds...')
+                time.sleep(15)
+    except KeyboardInterrupt:
+        # Caught out here rather than per attempt so Ctrl+C also ends the stream normally
+        # while sleeping in a reconnect backoff (an interrupt raised inside an except
+        # handler would skip a sibling handler). The attempt's finally has already set
+        # stop_event; session cleanup happens below.
+        logger.info("Stream interrupted by user. Shutting down.")
+        stop_event.set()
+        return
+    finally:
+        _save_state(state_path, subreddit_string, last_seen)
+        # PRAW does not close its HTTP session when polling is abandoned; release the pooled
+        # keep-alive sockets so repeated start/stop cycles do not leak connections.
+        # prawcore.Session.close() exists across prawcore 2.x-4.x.
+        reddit._core.close()
 
 # Tests the module in isolation. Does not run when imported.
 if __name__ == '__main__':
     # In script mode, ensure the root logger emits INFO. Tweak in production as needed.
     logging.getLogger().setLevel(logging.INFO)
     logger.info('Running reddit_listener.py as a standalone script.')
+
+    # Keep output short; avoid logging full bodies to reduce log noise.
+    # Each summary is assembled first and written once, rather than one print per line.
+    # subreddit_name_prefixed comes straight from the listing JSON, so no extra fetch.
+    def print_submission(item):
+        sys.stdout.write('\n'.join((
+            '-' * 40,
+            f'New Post in {item.subreddit_name_prefixed}:',
+            f'  Title: {item.title}',
+            f'  URL: https://www.reddit.com{item.permalink}',
+        )) + '\n')
+
+    def print_comment(item):
+        sys.stdout.write('\n'.join((
+            '-' * 40,
+            f'New Comment in {item.subreddit_name_prefixed}:',
+            f'  Comment: {item.body[:80]}...',
+            f'  URL: https://www.reddit.com{item.permalink}',
+        )) + '\n')
+
+    # Exact-type lookup; add entries here to print other item kinds.
+    HANDLERS = {
+        praw.models.Submission: print_submission,
+        praw.models.Comment: print_comment,
+    }
+
     try:
         reddit_instance = initialize_reddit()
 
@@ -172,26 +668,23 @@ if __name__ == '__main__':
 
         # Stream indefinitely and print a compact summary for each item.
         for item in stream_reddit_activity(reddit_instance, test_subreddits):
-            # Keep prints short; avoid logging full bodies to reduce log noise.
-            if isinstance(item, praw.models.Submission):
-                print('-' * 40)
-                print(f'New Post in r/{item.subreddit.display_name}:')
-                print(f'  Title: {item.title}')
-                print(f'  URL: https://www.reddit.com{item.permalink}')
-            elif isinstance(item, praw.models.Comment):
-                print('-' * 40)
-                print(f'New Comment in r/{item.subreddit.display_name}:')
-                print(f'  Comment: {item.body[:80]}...')
-                print(f'  URL: https://www.reddit.com{item.permalink}')
+            handler = HANDLERS.get(type(item))
+            if handler is None:
+                # Subclasses miss the exact-type lookup; fall back to isinstance.
+                handler = next(
+                    (h for kind, h in HANDLERS.items() if isinstance(item, kind)), None
+                )
+            if handler is not None:
+                handler(item)
     except ValueError as e:
         # Configuration issues should be explicit so operators can fix .env or env vars.
-        logger.error(f'Configuration Error: {e}')
+        logger.error('Configuration Error: %s', e)
     except RuntimeError as e:
         # Authentication failures: typically require changing credentials or app type/scopes.
-        logger.error(str(e))
+        logger.error('%s', e)
     except KeyboardInterrupt:
         # Graceful shutdown path (e.g., Docker stop, Ctrl+C).
         logger.info("Shut down by user.")
     except Exception as e:
         # Unexpected crash path; include stack trace for diagnosis.
-        logger.exception(f'An unexpected error occurred: {e}')
+        logger.exception('An unexpected error occurred: %s', e)
@@ -0,0 +1,220 @@
+"""
+Tests for the Reddit listener module.
+
+Reddit is replaced by a small fake client whose get() serves listings from memory, so
+polling, cursor and state-file logic can be checked without network access.
+"""
+
+import contextlib
+import json
+import os
+import threading
+
+import pytest
+
+from modules import reddit_listener
+
+
+class FakeItem:
+    """Stand-in for a PRAW Submission/Comment: only the fullname is needed."""
+
+    def __init__(self, fullname):
+        self.fullname = fullname
+
+
+class FakeCore:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeReddit:
+    """
+    Serves r/<subs>/new from a list of submission fullnames, honouring 'before' and 'limit'.
+
+    Records every request's params so tests can check what was asked for.
+    """
+
+    def __init__(self, fullnames):
+        self.fullnames = list(fullnames)  # oldest-first
+        self.requests = []
+        self._core = FakeCore()
+
+    def get(self, path, params):
+        self.requests.append((path, dict(params)))
+        newest_first = self.fullnames[::-1]
+        before = params.get('before')
+        if before is not None:
+            # Reddit returns only items newer than the anchor (nothing if it is gone).
+            newest_first = newest_first[:newest_first.index(before)] if before in newest_first else []
+        return [FakeItem(f) for f in newest_first[:params['limit']]]
+
+
+def poll(reddit, last_fullname, anchored=True, limit=100):
+    return reddit_listener._poll_listing(
+        reddit, threading.Lock(), 'r/a/new', last_fullname, anchored, limit
+    )
+
+
+def test_poll_listing_anchored_returns_new_items_oldest_first():
+    reddit = FakeReddit(['t3_a1', 't3_a2', 't3_a3'])
+
+    items, cursor = poll(reddit, 't3_a1')
+
+    assert [item.fullname for item in items] == ['t3_a2', 't3_a3']
+    assert cursor == 't3_a3'
+    assert reddit.requests == [('r/a/new', {'limit': 100, 'before': 't3_a1'})]
+
+
+def test_poll_listing_keeps_cursor_when_nothing_is_new():
+    reddit = FakeReddit(['t3_a1'])
+
+    items, cursor = poll(reddit, 't3_a1')
+
+    assert items == []
+    assert cursor == 't3_a1'
+
+
+def test_poll_listing_unanchored_filters_by_id():
+    # The anchor 't3_a2' was deleted, so an anchored poll would come back empty forever.
+    reddit = FakeReddit(['t3_a1', 't3_a3', 't3_a4'])
+
+    items, cursor = poll(reddit, 't3_a2', anchored=False)
+
+    assert [item.fullname for item in items] == ['t3_a3', 't3_a4']
+    assert cursor == 't3_a4'
+    assert 'before' not in reddit.requests[0][1]
+
+
+def test_poll_listing_cold_probe_uses_limit():
+    reddit = FakeReddit(['t3_a1', 't3_a2'])
+
+    items, cursor = poll(reddit, None, limit=1)
+
+    assert [item.fullname for item in items] == ['t3_a2']
+    assert cursor == 't3_a2'
+    assert reddit.requests == [('r/a/new', {'limit': 1})]
+
+
+def test_state_is_keyed_by_subreddit_string(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+
+    reddit_listener._save_state(state_path, 'a+b', {'last_sub': 't3_a1'})
+    reddit_listener._save_state(state_path, 'c', {'last_com': 't1_c1'})
+
+    assert reddit_listener._load_state(state_path, 'a+b') == {'last_sub': 't3_a1'}
+    assert reddit_listener._load_state(state_path, 'c') == {'last_com': 't1_c1'}
+    assert reddit_listener._load_state(state_path, 'd') == {}
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_load_state_without_path_or_file(tmp_path):
+    assert reddit_listener._load_state(None, 'a') == {}
+    assert reddit_listener._load_state(str(tmp_path / 'missing.json'), 'a') == {}
+
+
+@pytest.mark.parametrize('content', [
+    '{not json',
+    '["a"]',
+    '{"a": "t3_a1"}',
+    '{"a": {"last_sub": "t1_a1", "last_com": "t1_!!"}}',
+    '{"last_sub": "t3_a1"}',
+])
+def test_load_state_ignores_malformed_files(tmp_path, content):
+    state_path = tmp_path / 'state.json'
+    state_path.write_text(content, encoding='utf-8')
+
+    assert reddit_listener._load_state(str(state_path), 'a') == {}
+
+
+def test_save_state_failure_leaves_previous_file_intact(tmp_path, monkeypatch):
+    state_path = str(tmp_path / 'state.json')
+    reddit_listener._save_state(state_path, 'a', {'last_sub': 't3_a1'})
+
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(reddit_listener.os, 'replace', failing_replace)
+    reddit_listener._save_state(state_path, 'a', {'last_sub': 't3_a2'})
+
+    with open(state_path, encoding='utf-8') as f:
+        assert json.load(f) == {'a': {'last_sub': 't3_a1'}}
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def stream(reddit, state_path):
+    return reddit_listener.stream_reddit_activity(
+        reddit,
+        ['a'],
+        min_interval=0.01,
+        max_interval=0.02,
+        include_comments=False,
+        state_path=state_path,
+    )
+
+
+def test_item_whose_handling_fails_is_not_marked_done(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    reddit_listener._save_state(state_path, 'a', {'last_sub': 't3_a1'})
+    reddit = FakeReddit(['t3_a1', 't3_a2', 't3_a3'])
+
+    items = stream(reddit, state_path)
+    with pytest.raises(RuntimeError):
+        with contextlib.closing(items):
+            for item in items:
+                raise RuntimeError(f'could not handle {item.fullname}')
+
+    assert reddit_listener._load_state(state_path, 'a') == {'last_sub': 't3_a1'}
+    assert reddit._core.closed
+
+
+def test_handled_items_advance_saved_cursor(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    reddit_listener._save_state(state_path, 'a', {'last_sub': 't3_a1'})
+    reddit = FakeReddit(['t3_a1', 't3_a2', 't3_a3'])
+
+    with contextlib.closing(stream(reddit, state_path)) as items:
+        assert next(items).fullname == 't3_a2'
+        assert next(items).fullname == 't3_a3'
+
+    # t3_a3 was handed out but the consumer never came back for more.
+    assert reddit_listener._load_state(state_path, 'a') == {'last_sub': 't3_a2'}
+
+
+def test_cold_start_cursor_is_saved_without_items(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    reddit = FakeReddit(['t3_a1', 't3_a2'])
+    items = stream(reddit, state_path)
+
+    # Add a post once the cold-start probe has run, so the stream has something to yield.
+    def publish():
+        while not reddit.requests:
+            pass
+        reddit.fullnames.append('t3_a3')
+
+    threading.Thread(target=publish, daemon=True).start()
+    with contextlib.closing(items):
+        assert next(items).fullname == 't3_a3'
+
+    assert reddit.requests[0] == ('r/a/new', {'limit': 1})
+    assert reddit_listener._load_state(state_path, 'a') == {'last_sub': 't3_a2'}
+
+
+def test_subreddit_names_are_normalized_and_deduplicated():
+    normalize = reddit_listener._normalize_subreddits
+    assert normalize((' R/Rust', 'rust', '/r/Python', 'r/', '')) == 'rust+python'
+    assert normalize('a+ r/B +a') == 'a+b'
+    assert normalize(('  ',)) == ''
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'sub_reddits': []},
+    {'sub_reddits': ['a'], 'min_interval': 0},
+    {'sub_reddits': ['a'], 'min_interval': 5, 'max_interval': 1},
+    {'sub_reddits': ['a'], 'include_submissions': False, 'include_comments': False},
+])
+def test_stream_rejects_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        reddit_listener.stream_reddit_activity(FakeReddit([]), **kwargs)